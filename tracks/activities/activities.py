@@ -5,8 +5,10 @@ Define Activities
 """
 
 import warnings
+import operator
 import re
 import json
+import polars as pl
 from .operations import operator_dict
 from tracks.util import floatToHourMinSec, get_cast_func, get_reduce_func, get_reduce_func_key
 
@@ -132,6 +134,8 @@ class Measure:
                 unit = f"{units[0]}{self._relation.op.operator}{units[1]}"
         self._unit = unit
 
+        self._formatter = self._make_formatter()
+
         self._properties = [
             "name",
             "dtype",
@@ -195,26 +199,49 @@ class Measure:
             summary = get_reduce_func(summary)
         self._summary = summary
 
-    def formatted(self, value, include_unit=False, **kwargs):
-        """Return formatted string with value and, if requested, units"""
-        s = ""
-        match self.dtype:
+    def _make_formatter(self):
+        """Return function to format a single value of this measure, or None if unknown dtype."""
+        match self._dtype:
             case "float":
-                s = f"{value:.{self.sig_figs}f}"
+                return f"{{:.{self._sig_figs}f}}".format
             case "int":
-                s = f"{int(value)}"
+                return lambda value: str(int(value))
             case "date":
-                date_fmt = kwargs.get("date_fmt", "%d %b %Y")
-                s = value.strftime(date_fmt)
+                return operator.methodcaller("strftime", "%d %b %Y")
             case "duration":
-                s = floatToHourMinSec(value)
+                return floatToHourMinSec
             case _:
-                raise RuntimeError(f"Don't know how to format measure of type {self.dtype}")
+                return None
+
+    def formatted(self, value, include_unit=False, **kwargs):
+        """Return formatted string with value and, if requested, units"""
+        if self._dtype == "date" and (date_fmt := kwargs.get("date_fmt")) is not None:
+            s = value.strftime(date_fmt)
+        elif self._formatter is not None:
+            s = self._formatter(value)
+        else:
+            raise RuntimeError(f"Don't know how to format measure of type {self.dtype}")
 
         if include_unit and self.show_unit and self.unit is not None:
             s = f"{s} {self.unit}"
         return s
 
+    def formatted_batch(self, series) -> pl.Series:
+        """Return String Series, formatting every value in `series` as `formatted` does."""
+        match self._dtype:
+            case "float":
+                fmt = self._formatter
+                values = [None if v is None else fmt(v) for v in series.to_list()]
+                return pl.Series(series.name, values, pl.String)
+            case "int":
+                return series.cast(pl.Int64).cast(pl.String)
+            case "date":
+                return series.dt.strftime("%d %b %Y")
+            case _ if self._formatter is not None:
+                return series.map_elements(self._formatter, return_dtype=pl.String)
+            case _:
+                raise RuntimeError(f"Don't know how to format measure of type {self.dtype}")
+
     def summarised(self, value, **kwargs):
         """Call `summary` func on `value`, then call `formatted` with this and kwargs"""
         s = self.summary(value)
@@ -11,7 +11,7 @@ from .activities import Activity
 from tracks.plot import PlotWidget
 from tracks.data import Data, DataViewer, PersonalBests, AddData
 from tracks.preferences import DataPreferences, PlotPreferences
-from tracks.util import parse_month_range, get_data_path
+from tracks.util import parse_month_range, get_data_path, durations_to_float
 from qtpy.QtCore import QObject, Signal, Slot
 
 
@@ -202,6 +202,16 @@ class ActivityManager(QObject):
 
         df = pl.read_csv(filepath, separator=self.csv_sep, try_parse_dates=True)
 
+        # store durations as float hours, so they never need to be parsed again
+        durations = activity.filter_measures("dtype", lambda dtype: dtype == "duration")
+        for slug in durations:
+            if slug not in df.columns:
+                continue
+            col = df[slug]
+            if col.dtype == pl.String:
+                col = durations_to_float(col)
+            df = df.with_columns(col.cast(pl.Float64))
+
         return df
 
     def _activity_csv_file(self, activity: Activity, raise_not_exist=False):
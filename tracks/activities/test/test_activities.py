@@ -4,6 +4,7 @@ from pathlib import Path
 import shutil
 from datetime import datetime
 import json
+import polars as pl
 import pytest
 
 
@@ -181,6 +182,12 @@ class TestActivities:
         m = demo_activity[measure]
         assert m.formatted(value) == expected
 
+    @pytest.mark.parametrize(["measure", "value", "expected"], get_format_test_params())
+    def test_measure_formatted_batch(self, demo_activity, measure, value, expected):
+        m = demo_activity[measure]
+        series = pl.Series(measure, [value, None, value])
+        assert m.formatted_batch(series).to_list() == [expected, None, expected]
+
     def test_unknown_measure(self, demo_activity):
         measure = "invalid"
 
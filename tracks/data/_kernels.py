@@ -0,0 +1,137 @@
+"""
+Array routines behind some of the `Data` methods.
+
+These take and return plain numpy arrays (or lists), so they know nothing
+about polars or the Data object, and can be tested and optimised on their own.
+"""
+
+from datetime import datetime
+import heapq
+import numpy as np
+
+# proleptic Gregorian ordinal of 1970-01-01
+_EPOCH_ORDINAL = 719163
+
+# number of candidates filtered at once in `pb_indices`
+_BLOCK_SIZE = 256
+
+
+def pb_indices(values, pb_count) -> list:
+    """
+    Return indices of `values` which were in the top `pb_count` at the time.
+
+    The first `pb_count` values are always included.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1D array of values, in chronological order
+    pb_count : int
+        Number of values that can be PBs simultaneously
+
+    Returns
+    -------
+    list[int]
+    """
+    pb_count = min(pb_count, len(values))
+    if pb_count == 1:
+        # a PB is anything at least as good as the best so far
+        return np.flatnonzero(values >= np.maximum.accumulate(values)).tolist()
+
+    best = values[:pb_count].tolist()
+    heapq.heapify(best)  # min-heap, so best[0] is the value to beat
+    idx = list(range(pb_count))
+
+    # the value to beat never decreases, so anything below the initial one can
+    # be discarded up front and only the remaining candidates need the heap
+    candidates = np.flatnonzero(values[pb_count:] >= best[0]) + pb_count
+    # the threshold keeps rising, so filter the candidates again against it a
+    # block at a time, to keep the number of values checked in Python down
+    for start in range(0, len(candidates), _BLOCK_SIZE):
+        block = candidates[start : start + _BLOCK_SIZE]
+        block = block[values[block] >= best[0]]
+        for n, value in zip(block.tolist(), values[block].tolist()):
+            if value >= best[0]:
+                idx.append(n)
+                heapq.heapreplace(best, value)
+    return idx
+
+
+def insert_resets(dates, values, reset_dates, reset_value=0.0):
+    """
+    Insert `reset_value` at each of `reset_dates` into `dates` and `values`.
+
+    Each reset is placed before any entries with the same date.
+
+    Parameters
+    ----------
+    dates : np.ndarray
+        Sorted 1D datetime64 array
+    values : np.ndarray
+        1D array of values, same length as `dates`
+    reset_dates : np.ndarray
+        Sorted 1D datetime64 array of dates at which to insert `reset_value`
+    reset_value : float
+        Value to insert. Default is 0.
+
+    Returns
+    -------
+    (np.ndarray, np.ndarray)
+        New dates and values arrays
+    """
+    # position of each reset in the output is its insertion point in `dates`,
+    # shifted by the number of resets before it
+    size = len(dates) + len(reset_dates)
+    reset_pos = np.searchsorted(dates, reset_dates, side="left")
+    reset_pos = reset_pos + np.arange(len(reset_dates))
+    is_reset = np.zeros(size, dtype=bool)
+    is_reset[reset_pos] = True
+
+    out_dates = np.empty(size, dtype=dates.dtype)
+    out_dates[is_reset] = reset_dates
+    out_dates[~is_reset] = dates
+    out_values = np.full(size, reset_value, dtype=np.float64)
+    out_values[~is_reset] = values
+    return out_dates, out_values
+
+
+def local_midnight_timestamps(days) -> np.ndarray:
+    """
+    Return timestamps of local midnight on each of `days`.
+
+    This matches calling `datetime.timestamp` on a naive datetime of midnight
+    on each day, but the UTC offset is only looked up once per month, except
+    in months where it changes. The offset is always looked up, even if the
+    zone doesn't currently have DST, as it may have done in the past.
+
+    Parameters
+    ----------
+    days : np.ndarray
+        1D integer array of days since the epoch
+
+    Returns
+    -------
+    np.ndarray
+        float64 array of seconds since the epoch
+    """
+    utc = days.astype(np.float64) * 86400.0
+
+    # DST transitions are months apart, so if the offset is the same at the
+    # start of a month and the start of the next, it holds for the whole month
+    months = days.astype("datetime64[D]").astype("datetime64[M]")
+    months, inverse = np.unique(months, return_inverse=True)
+    starts = months.astype("datetime64[D]").astype(np.int64)
+    ends = (months + 1).astype("datetime64[D]").astype(np.int64)
+    start_offsets = np.array([_local_offset(day) for day in starts.tolist()])
+    end_offsets = np.array([_local_offset(day) for day in ends.tolist()])
+
+    offsets = start_offsets[inverse]
+    changes = (start_offsets != end_offsets)[inverse]
+    if changes.any():
+        offsets[changes] = [_local_offset(day) for day in days[changes].tolist()]
+    return utc + offsets
+
+
+def _local_offset(day) -> float:
+    """Return seconds between UTC midnight and local midnight on `day` days since the epoch."""
+    return datetime.fromordinal(day + _EPOCH_ORDINAL).timestamp() - day * 86400.0
@@ -5,8 +5,9 @@ Object providing convenient access to the contents of a DataFrame.
 
 from qtpy.QtCore import QObject
 from qtpy.QtCore import Signal, Slot
-from tracks.util import parseDate, parseDuration, hourMinSecToFloat, floatToHourMinSec
-from collections import namedtuple
+from tracks.util import parseDate
+from ._kernels import pb_indices, insert_resets, local_midnight_timestamps
+from collections import namedtuple, defaultdict
 from datetime import date, datetime
 import numpy as np
 import polars as pl
@@ -16,7 +17,7 @@ import functools
 def check_empty(func):
     @functools.wraps(func)
     def wrapped(self, *args, **kwargs):
-        if self.df.is_empty():
+        if self._empty:
             return []
         else:
             return func(self, *args, **kwargs)
@@ -32,8 +33,8 @@ class Data(QObject):
     """
     **signal** data_changed(object `index`)
 
-    Emitted when the data in the object is changed, with the pandas index
-    of the new rows.
+    Emitted when the data in the object is changed, with the indices
+    of the new rows, or None if existing rows have moved.
     """
 
     new_max = Signal(str, object)
@@ -48,10 +49,111 @@ class Data(QObject):
         Object providing convenience functions for accessing data from a given DataFrame.
         """
         super().__init__()
+        df = self._coerce_dtypes(df, activity)
+        df = self._apply_relations(df, activity)
+        self._setup(df, activity)
 
-        self.df = self._apply_relations(df, activity)
+    @classmethod
+    def _from_trusted_df(cls, df, activity):
+        """
+        Return new Data object for `df`, without checking its dtypes or relations.
+
+        Only use this when `df` is derived from the frame of a Data object for
+        the same `activity`, e.g. a subset or concatenation of them.
+        """
+        data = cls.__new__(cls)
+        super(Data, data).__init__()
+        data._setup(df, activity)
+        return data
+
+    def _setup(self, df, activity):
+        """Set `df` and `activity` and look up values derived from `activity`."""
+        self._cache = {}
+        # keep each column in a single contiguous chunk (a no-op if it already is)
+        self.df = df.rechunk()
 
         self._activity = activity
+        # the activity's measures don't change, so look these up once
+        self._relations = activity.get_relations()
+        self._summary_measures = {
+            slug: measure
+            for slug, measure in activity.measures.items()
+            if measure.summary is not None
+        }
+
+    @property
+    def df(self):
+        """polars DataFrame of the data."""
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+        self._clear_cache()
+
+    def _clear_cache(self):
+        """
+        Discard all values derived from `df`.
+
+        This is called whenever `df` is set, but must also be called
+        explicitly if `df` is modified in place.
+
+        As well as columns and arrays, this holds memoised results of
+        `split_months`, `get_monthly_odometer` and `get_pbs`, which are
+        requested repeatedly by the plot and viewer between edits.
+        """
+        # drop columns memoised as instance attributes by `__getattr__`
+        for name in self._cache.get("columns", ()):
+            self.__dict__.pop(name, None)
+        self._cache.clear()
+        self._empty = self._df.is_empty()
+
+    def _columns(self) -> dict:
+        """Return dict of column name: Series, cached until `df` changes."""
+        if (columns := self._cache.get("columns")) is None:
+            columns = {series.name: series for series in self._df.get_columns()}
+            self._cache["columns"] = columns
+        return columns
+
+    def _column_values(self) -> dict:
+        """Return dict of column name: list of values, cached until `df` changes."""
+        if (values := self._cache.get("column_values")) is None:
+            values = {name: self._column_list(name) for name in self._columns()}
+            self._cache["column_values"] = values
+        return values
+
+    def _column_list(self, name) -> list:
+        """Return list of values in column `name`, cached until `df` changes."""
+        key = ("column_list", name)
+        if (values := self._cache.get(key)) is None:
+            values = self._columns()[name].to_list()
+            self._cache[key] = values
+        return values
+
+    def _arrays(self) -> dict:
+        """Return dict of column name: numpy array of numeric columns, cached until `df` changes."""
+        if (arrays := self._cache.get("arrays")) is None:
+            arrays = {
+                name: series.to_numpy()
+                for name, series in self._columns().items()
+                if series.dtype.is_numeric()
+            }
+            self._cache["arrays"] = arrays
+        return arrays
+
+    def _measures(self) -> dict:
+        """Return dict of column name: Measure, cached until `df` changes."""
+        if (measures := self._cache.get("measures")) is None:
+            measures = {name: self._activity.get_measure(name) for name in self._df.columns}
+            self._cache["measures"] = measures
+        return measures
+
+    def _dates_sorted(self) -> bool:
+        """Return True if the 'date' column is in ascending order, cached until `df` changes."""
+        if (is_sorted := self._cache.get("dates_sorted")) is None:
+            is_sorted = self._columns()["date"].is_sorted()
+            self._cache["dates_sorted"] = is_sorted
+        return is_sorted
 
     @staticmethod
     def concat(datas, activity):
@@ -63,12 +165,16 @@ class Data(QObject):
             if len(dfs) == 0:
                 raise ValueError("Cannot concat empty sequence")
             tmp_df = pl.concat(dfs)
-            new_data = Data(tmp_df, activity)
+            if all(data._activity is activity for data in datas):
+                # every frame already has this activity's dtypes and relations
+                new_data = Data._from_trusted_df(tmp_df, activity)
+            else:
+                new_data = Data(tmp_df, activity)
             return new_data
 
     def formatted(self, key):
         measure = self._activity[key]
-        return [measure.formatted(v) for v in self.df[key]]
+        return measure.formatted_batch(self.df[key]).to_list()
 
     def summary_string(self, key, func=sum, unit=False):
         measure = self._activity[key]
@@ -76,10 +182,10 @@ class Data(QObject):
         return s
 
     def make_summary(self, unit=False) -> dict:
+        columns = self._columns()
         summaries = {
-            slug: self.summary_string(slug, unit=unit)
-            for slug, measure in self._activity.measures.items()
-            if measure.summary is not None
+            slug: measure.summarised(columns[slug], include_unit=unit)
+            for slug, measure in self._summary_measures.items()
         }
         return summaries
 
@@ -94,13 +200,14 @@ class Data(QObject):
         """
         if isinstance(key, tuple):
             idx, key = key
-            return self.df[int(idx), key]
+            if key not in self._columns():
+                # let polars raise its usual error
+                return self.df[int(idx), key]
+            return self._column_list(key)[int(idx)]
 
         elif isinstance(key, str):
-            if key in self.df.columns:
-                # return self.df[key]
-                # name = self._quickNames[key]
-                return getattr(self, key)
+            if (column := self._columns().get(key)) is not None:
+                return column
             else:
                 raise NameError(f"{key} not a valid property name.")
 
@@ -108,7 +215,16 @@ class Data(QObject):
             raise KeyError(f"Cannot access item with key {key}")
 
     def __getattr__(self, name):
-        ret = self.df[name]
+        if name.startswith("_"):
+            # private attributes are never columns; don't recurse if `_cache`
+            # or `_df` haven't been set yet
+            raise AttributeError(name)
+        if (ret := self._columns().get(name)) is None:
+            msg = f"'{type(self).__name__}' object has no attribute or column '{name}'"
+            raise AttributeError(msg)
+        # store on the instance, so subsequent lookups don't come through
+        # here; removed again by `_clear_cache`
+        self.__dict__[name] = ret
         return ret
 
     def __repr__(self):
@@ -120,13 +236,28 @@ class Data(QObject):
 
         If `formatted` is True, also format the values.
         """
-        row = dict(zip(self.df.columns, self.df.row(idx)))
-        if formatted:
-            row = {
-                name: self._activity.get_measure(name).formatted(value)
-                for name, value in row.items()
-            }
-        return row
+        columns = self._column_values()
+        if not formatted:
+            return {name: values[idx] for name, values in columns.items()}
+        # format as each value is taken, rather than building the row twice
+        measures = self._measures()
+        return {name: measures[name].formatted(values[idx]) for name, values in columns.items()}
+
+    def rows(self, indices, formatted=False) -> list:
+        """
+        Return list of dicts of rows at `indices`.
+
+        Equivalent to `[row(idx, formatted) for idx in indices]`, but
+        the rows are taken and formatted in a single pass over each column.
+        """
+        df = self.df[list(indices)]
+        if not formatted:
+            return df.rows(named=True)
+        measures = self._measures()
+        columns = {
+            name: measure.formatted_batch(df[name]).to_list() for name, measure in measures.items()
+        }
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
 
     def to_string(self, headTail=None):
         """
@@ -138,7 +269,32 @@ class Data(QObject):
             If provided, abridge the object to show only the first and last
             `headTail` rows. By default, do not abridge and return the full object.
         """
-        return repr(self.df)
+        size = len(self.df)
+        abridged = headTail is not None and size > 2 * headTail
+        if abridged:
+            # only format the rows that will actually be shown
+            df = pl.concat([self.df.head(headTail), self.df.tail(headTail)])
+        else:
+            df = self.df
+
+        keys = df.columns
+        measures = self._activity.measures
+        columns = {}
+        for key in keys:
+            # columns without a measure (e.g. an index added by `sort`) are shown as they are
+            if (measure := measures.get(key)) is None:
+                series = df[key].cast(pl.String)
+            else:
+                series = measure.formatted_batch(df[key])
+            columns[key] = series.fill_null("null").to_list()
+        widths = {key: max([len(key)] + [len(s) for s in columns[key]]) for key in keys}
+
+        lines = ["  ".join(f"{key:>{widths[key]}}" for key in keys)]
+        for n in range(len(df)):
+            if abridged and n == headTail:
+                lines.append("  ".join(f"{'...':>{widths[key]}}" for key in keys))
+            lines.append("  ".join(f"{columns[key][n]:>{widths[key]}}" for key in keys))
+        return "\n".join(lines)
 
     @Slot(dict)
     def append(self, dct):
@@ -147,21 +303,55 @@ class Data(QObject):
             msg = f"Can only append dict to Data, not {type(dct).__name__}"
             raise TypeError(msg)
 
-        schema = self.df.columns
-        for relation_name in self._activity.get_relations():
-            if relation_name not in dct:
-                schema.remove(relation_name)
+        # relations not given in `dct` are calculated by `_apply_relations`
+        relations = self._relations
+        schema = [name for name in self.df.columns if name not in relations or name in dct]
 
         tmp_df = pl.DataFrame(dct, schema=schema)
+        tmp_df = self._coerce_dtypes(tmp_df, self._activity)
         tmp_df = self._apply_relations(tmp_df, self._activity)
-        self.df.extend(tmp_df)
-        self.df = self.df.sort("date")
-
+        num_old = len(self.df)
         num_new = len(tmp_df)
-        size = len(self.df)
-        index = list(range(size - num_new, size))
+        new_dates = tmp_df["date"]
+        was_sorted = self._dates_sorted()
+        if was_sorted:
+            # binary search for where each new row goes (after any existing
+            # rows with the same date), instead of re-sorting the whole frame
+            new_order = np.argsort(new_dates.to_numpy(), kind="stable")
+            insert = self._columns()["date"].search_sorted(new_dates[new_order], side="right")
+            new_pos = insert.to_numpy() + np.arange(num_new)
+        self.df.extend(tmp_df)
 
-        self.data_changed.emit(index)
+        if not was_sorted:
+            # sort by date, keeping track of where the new rows end up
+            order = np.argsort(self.df["date"].to_numpy(), kind="stable")
+            position = np.empty_like(order)
+            position[order] = np.arange(len(order))
+            self.df = self.df[order]
+            index = position[num_old:].tolist()
+            moved = not np.array_equal(position[:num_old], np.arange(num_old))
+        elif new_dates.is_sorted() and np.all(new_pos >= num_old):
+            # usually new sessions are the most recent (and given in order), so
+            # nothing needs to move
+            self._clear_cache()
+            index = new_pos.tolist()
+            moved = False
+        else:
+            # splice the new rows in at their positions
+            is_new = np.zeros(num_old + num_new, dtype=bool)
+            is_new[new_pos] = True
+            take = np.empty(num_old + num_new, dtype=np.int64)
+            take[~is_new] = np.arange(num_old)
+            take[is_new] = num_old + new_order
+            self.df = self.df[take]
+            index = np.empty(num_new, dtype=np.int64)
+            index[new_order] = new_pos
+            index = index.tolist()
+            moved = bool(np.any(new_pos < num_old))
+
+        # if any existing rows have moved, their indices are no longer valid,
+        # so everything needs to be refreshed
+        self.data_changed.emit(None if moved else index)
 
     def update(self, values):
         """
@@ -177,78 +367,149 @@ class Data(QObject):
         Example `values` structure:
             {10: {'distance':25, 'Calories':375}}
         """
-        changed = []
+        # group new values by column, so each column is written once
+        by_column = defaultdict(dict)
         for index, dct in values.items():
             for col, value in dct.items():
-                if self.df[index, col] != value:
-                    self.df[index, col] = value
-                    changed.append(index)
+                by_column[col][index] = value
+
+        changed = set()
+        new_columns = []
+        for col, new_values in by_column.items():
+            # compare all the new values for this column with the current ones at once
+            series = self._columns()[col]
+            idx = pl.Series(list(new_values), dtype=pl.Int64)
+            new = pl.Series(list(new_values.values()), dtype=series.dtype)
+            diff = series.gather(idx).ne_missing(new)
+            if diff.any():
+                idx, new = idx.filter(diff), new.filter(diff)
+                new_columns.append(series.clone().scatter(idx, new))
+                changed.update(idx.to_list())
+
         if changed:
+            changed = sorted(changed)
+            self.df = self.df.with_columns(new_columns)
             self._update_relations(changed)
             self.data_changed.emit(changed)
 
+    @staticmethod
+    def _coerce_dtypes(df, activity) -> pl.DataFrame:
+        """
+        Store 'int' measures in `df` as Int32 and 'date' measures as Date.
+
+        Counts and metadata such as gear fit easily in 32 bits, which halves the
+        memory read by scans over these columns. Dates never have a time
+        component, so a 32-bit Date is enough, rather than a 64-bit Datetime.
+        """
+        schema = df.schema
+        casts = {pl.Int32: [], pl.Date: []}
+        for name, measure in activity.measures.items():
+            if name not in schema:
+                continue
+            if measure.dtype == "int" and schema[name] != pl.Int32:
+                casts[pl.Int32].append(name)
+            elif measure.dtype == "date" and schema[name] != pl.Date:
+                casts[pl.Date].append(name)
+        exprs = [pl.col(names).cast(dtype) for dtype, names in casts.items() if names]
+        if exprs:
+            df = df.with_columns(exprs)
+        return df
+
     @staticmethod
     def _apply_relations(df, activity) -> pl.DataFrame():
         """
         Check if relational measures in `activity` are present in `df`.
 
-        If not, create them.
+        If not, create them. Float relations are stored as Float32: they are
+        derived (and so never need to round-trip exactly) and are only read
+        in bulk, e.g. for plotting and finding PBs.
         """
         relations = activity.get_relations()
-        for name, relation in relations.items():
-            if name not in df.columns:
-                m0 = df[relation.m0.slug]
-                m1 = df[relation.m1.slug]
-                # df[name] = relation.op.call(m0, m1)
-                new_col = relation.op.call(m0, m1)
-                df = df.with_columns(new_col.alias(name))
+        schema = df.schema
+        missing = [name for name in relations if name not in schema]
+        recast = [
+            name
+            for name in relations
+            if activity[name].dtype == "float" and schema.get(name) != pl.Float32
+        ]
+        if not missing and not recast:
+            # common case, e.g. a month of an existing Data object
+            return df
+
+        for name in missing:
+            relation = relations[name]
+            m0 = df[relation.m0.slug]
+            m1 = df[relation.m1.slug]
+            new_col = relation.op.call(m0, m1)
+            df = df.with_columns(new_col.alias(name))
+        if recast:
+            df = df.with_columns(pl.col(recast).cast(pl.Float32))
         return df
 
     def _update_relations(self, idx):
         """Recalculate relational data for all indices in iterable `idx`"""
-        # recalculate relational data
-        for col, relation in self._activity.get_relations().items():
-            m0 = self.df[relation.m0.slug][idx]
-            m1 = self.df[relation.m1.slug][idx]
-            self.df[idx, col] = relation.op.call(m0, m1)
+        idx = np.asarray(idx, dtype=np.int64)
+        # recalculate relational data on the numpy buffers, then write each
+        # relation column back in a single scatter
+        for col, relation in self._relations.items():
+            arrays = self._arrays()
+            m0 = arrays[relation.m0.slug][idx]
+            m1 = arrays[relation.m1.slug][idx]
+            new_col = self.df[col].scatter(idx, relation.op.call(m0, m1))
+            self.df = self.df.with_columns(new_col)
 
     def set_data_frame(self, df):
         """Set new DataFrame"""
-        # TODO activity, _apply_relations etc?
         # called if csv changed on disk
-        self.df = df
-        self.data_changed.emit(self.df.index)
+        df = self._coerce_dtypes(df, self._activity)
+        df = self._apply_relations(df, self._activity)
+        self.df = df.rechunk()
+        # polars frames have no index, and every row may have changed
+        self.data_changed.emit(None)
 
     @property
     def date_timestamps(self):
         """
         Return 'date' column, converted to array of timestamps (time since epoch).
 
+        The array is cached until `df` changes, so should not be modified.
+
         See also: :py:meth:`datetimes`.
         """
-        return np.array([dt.timestamp() for dt in self.datetimes])
+        if (timestamps := self._cache.get("date_timestamps")) is None:
+            # timestamps are of local midnight, to match datetime.timestamp(),
+            # which is what the plot axis expects
+            days = self._columns()["date"].to_physical().to_numpy()
+            timestamps = local_midnight_timestamps(days)
+            self._cache["date_timestamps"] = timestamps
+        return timestamps
 
     @property
     def datetimes(self):
-        """Return 'date' column, converted to list of datetime objects."""
-        fmt = "%Y-%m-%d"
-        # 'strptime(d.strftime(fmt), fmt)' this is ugly and is required
-        # because the date column is a pandas datetime object, but it adds an
-        # empty time to the date, which we need to get rid of here, before
-        # calling datetime.strptime
-        return [datetime.strptime(d.strftime(fmt), fmt) for d in self.df["date"]]
+        """
+        Return 'date' column, converted to list of datetime objects.
+
+        The list is cached until `df` changes, so should not be modified.
+        """
+        if (datetimes := self._cache.get("datetimes")) is None:
+            # casting Date to Datetime gives midnight on each date
+            datetimes = self._columns()["date"].cast(pl.Datetime("us")).to_list()
+            self._cache["datetimes"] = datetimes
+        return datetimes
 
     def get_month(self, month, year, return_type="DataFrame"):
         """Return DataFrame or Data of data from the given month and year."""
         ts0 = date(year, month, 1)
-        month += 1
-        if month > 12:
-            month %= 12
-            year += 1
-        ts1 = date(year, month, 1)
-        df = self.df.filter((pl.col("date") >= ts0) & (pl.col("date") < ts1))
+        ts1 = date(year + month // 12, month % 12 + 1, 1)  # first of the next month
+        if self._dates_sorted():
+            # binary search for the month's bounds and take a zero-copy slice
+            bounds = pl.Series([ts0, ts1], dtype=pl.Date)
+            lo, hi = self._columns()["date"].search_sorted(bounds, side="left").to_list()
+            df = self.df.slice(lo, hi - lo)
+        else:
+            df = self.df.filter(pl.col("date").is_between(ts0, ts1, closed="left"))
         if return_type == "Data":
-            df = Data(df, activity=self._activity)
+            df = Data._from_trusted_df(df, self._activity)
         return df
 
     @check_empty
@@ -276,46 +537,56 @@ class Data(QObject):
             msg += f"Valid values are {', '.join(valid_return_types)}"
             raise ValueError(msg)
 
-        groups = self.df.group_by_dynamic("date", every="1mo")
-        groups = [MonthData(month[0], group) for month, group in groups]
-
-        if include_empty:
-            # if `include_empty`, check for missing months and add empty df
-            groups = self._add_empty_months(groups)
+        key = ("split_months", include_empty, return_type)
+        if (groups := self._cache.get(key)) is not None:
+            return list(groups)
 
         if return_type == "Data":
-            for n, (month, group) in enumerate(groups):
-                df = Data(group, activity=self._activity)
-                groups[n] = MonthData(month, df)
-
-        return groups
-
-    def _add_empty_months(self, groups):
-        missing = []
+            # wrap each month as it is made, rather than in a second pass
+            wrap = functools.partial(Data._from_trusted_df, activity=self._activity)
+        else:
+            wrap = None
 
-        for i, (month, _) in enumerate(groups[:-1]):
-            expected_next_month = month.month + 1
-            expected_next_year = month.year
-            if expected_next_month > 12:
-                expected_next_month = 1
-                expected_next_year += 1
+        groups = self.df.group_by_dynamic("date", every="1mo")
+        if wrap is None:
+            groups = [MonthData(month[0], group) for month, group in groups]
+        else:
+            groups = [MonthData(month[0], wrap(group)) for month, group in groups]
 
-            next_month = groups[i + 1][0]
+        if include_empty:
+            # if `include_empty`, check for missing months and add empty df
+            groups = self._add_empty_months(groups, wrap)
 
-            while (next_month.month != expected_next_month) and (
-                next_month.year != expected_next_year
-            ):
-                month_dt = date(expected_next_year, expected_next_month, 1)
-                df = pl.DataFrame(schema=self._activity.measure_slugs)
-                missing.append(MonthData(month_dt, df))
-                expected_next_month += 1
-                if expected_next_month > 12:
-                    expected_next_month = 1
-                    expected_next_year += 1
+        self._cache[key] = groups
+        return list(groups)
 
-        groups += missing
+    def _add_empty_months(self, groups, wrap=None):
+        """
+        Return `groups` with an empty DataFrame for every missing month in its range.
 
-        return sorted(groups)
+        If `wrap` is given, it is called to make a new object from the empty
+        DataFrame for each missing month.
+        """
+        first, last = groups[0].month_year, groups[-1].month_year
+        num_months = (last.year - first.year) * 12 + last.month - first.month + 1
+        if num_months == len(groups):
+            # no months missing
+            return groups
+
+        by_month = dict(groups)
+        month_starts = pl.date_range(first, last, interval="1mo", eager=True)
+        # polars frames are immutable, so all the empty months can share one
+        # zero-row frame with this frame's schema
+        empty = self.df.clear()
+        if wrap is None:
+            groups = [MonthData(month, by_month.get(month, empty)) for month in month_starts]
+        else:
+            # each missing month gets its own object, as Data objects are mutable
+            groups = [
+                MonthData(month, by_month[month] if month in by_month else wrap(empty))
+                for month in month_starts
+            ]
+        return groups
 
     def get_monthly_odometer(self):
         """
@@ -324,30 +595,38 @@ class Data(QObject):
         The datetime objects are required, as they add dummy 1st of the
         month data points to reset the total to 0km.
         """
-        dfs = self.split_months(include_empty=True)
-        odo = []
-        dts = []
-
-        for i, (month_year, df) in enumerate(dfs):
-            # at the start of every month, insert 0km entry
-            if df.is_empty():
-                # if there's no data in the df, make new dt
-                month = month_year.month
-                year = month_year.year
-            else:
-                month = df["date"][0].month
-                year = df["date"][0].year
-            tmp = date(year, month, 1)
-            dts.append(tmp)
-            odo.append(0)
-
-            for row in df.rows(named=True):
-                dt = row["date"]
-                dist = odo[-1] + row["distance"]
-                dts.append(dt)
-                odo.append(dist)
-
-        return dts, odo
+        if self._empty:
+            return [], []
+
+        if (odometer := self._cache.get("monthly_odometer")) is not None:
+            dates, odo = odometer
+            return list(dates), list(odo)
+
+        # only the date and distance columns are needed, so select them before
+        # sorting (if necessary) and compute the running total of distance
+        # within each month in the same query
+        lf = self.df.lazy().select("date", "distance")
+        if not self._dates_sorted():
+            lf = lf.sort("date", maintain_order=True)
+        month = pl.col("date").dt.truncate("1mo")
+        df = lf.select(
+            pl.col("date"),
+            pl.col("distance").cum_sum().over(month).cast(pl.Float64).alias("odo"),
+            month.alias("month"),
+        ).collect()
+
+        # at the start of every month (including months without data), insert 0km entry
+        dates, odo, months = df["date"], df["odo"], df["month"]
+        month_starts = pl.date_range(months.min(), months.max(), interval="1mo", eager=True)
+        month_starts = month_starts.cast(dates.dtype)
+
+        out_dates, out_odo = insert_resets(
+            dates.to_numpy(), odo.to_numpy(), month_starts.to_numpy()
+        )
+
+        dates, odo = out_dates.tolist(), out_odo.tolist()
+        self._cache["monthly_odometer"] = (dates, odo)
+        return list(dates), list(odo)
 
     @check_empty
     def get_pbs(self, column, pbCount):
@@ -366,49 +645,33 @@ class Data(QObject):
         idx : List[int]
             list of indices of PBs
         """
-        series = self[column]
-        if pbCount > len(series):
-            pbCount = len(series)
-        best = list(series[:pbCount])
-        idx = list(range(pbCount))  # first pbCount values will be PBs
-        for n in range(pbCount, len(series)):
-            if series[n] >= np.min(best):
-                idx.append(n)
-                # replace value in best array
-                minIdx = np.argmin(best)
-                best[minIdx] = series[n]
-        return idx
+        key = ("pbs", column, pbCount)
+        if (idx := self._cache.get(key)) is None:
+            idx = pb_indices(self._arrays()[column], pbCount)
+            self._cache[key] = idx
+        return list(idx)
 
     def combine_rows(self, date):
         """Combine all rows in the dataframe with the given data."""
         d = parseDate(date)
-        idx = self.df.with_row_index().filter(pl.col("date") == d)["index"]
-
-        # sum 'simple' data
-        cols = [
-            col
-            for col in self.df.columns
-            if self._activity.get_measure(col).relation is None
-            and self._activity.get_measure(col).is_metadata is False
-        ]
-
-        for col in cols:
-            series = self.df[col][idx]
-            if col == "Time":
-                series = [hourMinSecToFloat(parseDuration(value)) for value in series]
-                new_value = sum(series)
-                new_value = floatToHourMinSec(new_value)
-            else:
-                new_value = sum(series)
-            self.df[idx[0], col] = new_value
-
-        i0, *idx = idx
-
-        # recalculate relational data
-        self._update_relations([i0])
-
-        self._drop_by_index(idx)
-        self.data_changed.emit(i0)
+        mask = self._columns()["date"] == d
+        i0 = mask.arg_true()[0]
+
+        # sum 'simple' data, keep the first row's metadata and recalculate
+        # relational data from the totals
+        measures = self._measures()
+        combined = self.df.filter(mask).select(
+            pl.col(col).sum() if measure.is_metadata is False else pl.col(col).first()
+            for col, measure in measures.items()
+            if measure.relation is None
+        )
+        combined = self._apply_relations(combined, self._activity).select(self.df.columns)
+
+        # replace the first row with the combined one and drop the others
+        tail = self.df.slice(i0 + 1).filter(~mask.slice(i0 + 1))
+        self.df = pl.concat([self.df.slice(0, i0), combined, tail])
+        # rows after the combined ones have moved, so everything needs refreshing
+        self.data_changed.emit(None)
 
     def remove_rows(self, **kwargs):
         """
@@ -416,7 +679,7 @@ class Data(QObject):
 
         Pass either 'dates' or 'index' kwarg.
         """
-        idx = kwargs.get("index", [])
+        idx = list(kwargs.get("index", []))
 
         dates = kwargs.get("dates", None)
         if dates is not None:
@@ -425,8 +688,12 @@ class Data(QObject):
             if not isinstance(dates, list):
                 raise TypeError("Data.removeRows takes list of dates")
 
-            dates = [parseDate(date) for date in dates]
-            idx += self.df.with_row_index().filter(pl.col("date").is_in(dates))["index"]
+            # results can depend on today's date, so only parse each distinct
+            # string once per call rather than caching across calls
+            dates = [parseDate(date) for date in set(dates)]
+            # single membership pass over the date column
+            mask = self._columns()["date"].is_in(dates)
+            idx += mask.arg_true().to_list()
 
         if idx:
             self._drop_by_index(idx)
@@ -441,9 +708,13 @@ class Data(QObject):
         idx : list[int]
             List of indices
         """
-        self.df = self.df.with_row_index().filter(~pl.col("index").is_in(idx)).drop("index")
+        keep = np.ones(len(self.df), dtype=bool)
+        keep[np.asarray(idx, dtype=np.int64)] = False
+        self.df = self.df.filter(pl.Series(keep))
 
-    def sort(self, *args, return_type="Data", with_index=False, index_name="index", **kwargs):
+    def sort(
+        self, *args, return_type="Data", with_index=False, index_name="index", limit=None, **kwargs
+    ):
         """
         Return new Data object (or polars DataFrame) with sorted data.
 
@@ -462,12 +733,22 @@ class Data(QObject):
             If True, add index column before sorting.
         index_name : str, optional
             If `with_index`, optionally set the name of the index column. Default is "index".
+        limit : int, optional
+            If given, only return the first `limit` rows of the sorted data. This
+            is cheaper than sorting everything and slicing afterwards.
         kwargs
             [Dataframe.sort](https://docs.pola.rs/api/python/stable/reference/dataframe/api/polars.DataFrame.sort.html)
             kwargs
         """
-        df = self.df.with_row_index(name=index_name) if with_index else self.df
-        df = df.sort(*args, **kwargs)
+        # build as a lazy query, so that polars can do a partial (top-k) sort
+        # when `limit` is given
+        lf = self.df.lazy()
+        if with_index:
+            lf = lf.with_row_index(name=index_name)
+        lf = lf.sort(*args, **kwargs)
+        if limit is not None:
+            lf = lf.head(limit)
+        df = lf.collect()
         if return_type == "Data":
-            df = Data(df, activity=self._activity)
+            df = Data._from_trusted_df(df, self._activity)
         return df
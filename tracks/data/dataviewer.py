@@ -10,23 +10,26 @@ from qtpy.QtWidgets import (
     QMessageBox,
     QMenu,
     QAction,
+    QStyledItemDelegate,
 )
-from qtpy.QtCore import QSize, Qt
+from qtpy.QtCore import QSize, Qt, QTimer
 from qtpy.QtCore import Signal, Slot
 from qtpy.QtGui import QKeySequence, QFont
 import calendar
+import contextlib
 from dataclasses import dataclass
+import functools
 from .edititemdialog import EditItemDialog
-from tracks.util import (
-    checkHourMinSecFloat,
-    checkMonthYearFloat,
-    isFloat,
-    hourMinSecToFloat,
-    monthYearToFloat,
-)
+from tracks.util import dayMonthYearToFloat, hourMinSecToFloat, monthYearToFloat
 from . import Data
 
 
+@functools.lru_cache(maxsize=512)
+def _month_year_str(month, year) -> str:
+    """Return 'month year' string, e.g. 'January 2024', as used for top level items."""
+    return f"{calendar.month_name[month]} {year}"
+
+
 class CycleTreeWidgetItem(QTreeWidgetItem):
     """QTreeWidgetItem subclass, with __lt__ method overridden, so that
     the QTreeWidget can sort the items, where each column may contain
@@ -36,33 +39,67 @@ class CycleTreeWidgetItem(QTreeWidgetItem):
     to the desired sort column index on every instance of this object
     before calling `QTreeWidget.sortItems()`. As far as I can tell, the
     `idx` arg to `QTreeWidget.sortItems()` is ignored.
+
+    If `casts` is given, it should be a sequence of functions to convert the
+    text in each column to a sortable value, as returned by `get_casts`.
+    Otherwise, each of `_sort_casts` is tried on every cell.
+
+    `month_key` is an optional (month, year) tuple of ints for the month
+    this item represents.
     """
 
-    def __init__(self, *args, row=[], **kwargs):
+    # functions to try, in order, to convert text to a sortable value
+    _sort_casts = (float, monthYearToFloat, hourMinSecToFloat)
+
+    def __init__(self, *args, row=[], casts=None, month_key=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.sortColumn = 0
+        self.month_key = month_key
+        self._casts = casts
         self.setRow(row)
 
-    def __lt__(self, other):
-        item0 = self.text(self.sortColumn)
-        item1 = other.text(self.sortColumn)
+    @staticmethod
+    def get_casts(activity) -> tuple:
+        """
+        Return tuple of functions to cast the text in each column of a month item.
 
-        cast = self._get_item_cast(item0, item1)
-        if cast is not None:
-            return cast(item0) < cast(item1)
-        else:
-            return item0 < item1
+        The first column is the month and year, followed by the summary of
+        each measure in `activity` which has one.
+        """
+        casts = [monthYearToFloat]
+        for measure in activity.measures.values():
+            if measure.summary is not None:
+                casts.append(IndexTreeWidgetItem._sort_casts.get(measure.dtype))
+        return tuple(casts)
 
-    @staticmethod
-    def _get_item_cast(item0, item1):
-        if isFloat(item0) and isFloat(item1):
-            return float
-        elif checkMonthYearFloat(item0) and checkMonthYearFloat(item1):
-            return monthYearToFloat
-        elif checkHourMinSecFloat(item0) and checkHourMinSecFloat(item1):
-            return hourMinSecToFloat
+    def __lt__(self, other):
+        col = self.sortColumn
+        key0, key1 = self._sort_keys[col], other._sort_keys[col]
+        if self._casts is not None and other._casts is not None:
+            # one key per cell, so compare them directly if both casts worked
+            if key0 is not None and key1 is not None:
+                return key0 < key1
         else:
-            return None
+            # compare with the first cast that worked for both items
+            for k0, k1 in zip(key0, key1):
+                if k0 is not None and k1 is not None:
+                    return k0 < k1
+        return self.text(col) < other.text(col)
+
+    @classmethod
+    def _get_sort_keys(cls, text, casts=None) -> tuple:
+        """
+        Return tuple of `text` cast by each of `casts`, or None where that fails.
+
+        If `casts` is not given, `_sort_casts` is used.
+        """
+        keys = []
+        for cast in cls._sort_casts if casts is None else casts:
+            try:
+                keys.append(cast(text))
+            except (ValueError, TypeError):
+                keys.append(None)
+        return tuple(keys)
 
     @property
     def sortColumn(self):
@@ -74,12 +111,19 @@ class CycleTreeWidgetItem(QTreeWidgetItem):
 
     def setRow(self, row):
         self.row = row
+        # cast the text once here, rather than on every comparison when sorting
+        if self._casts is None:
+            self._sort_keys = [self._get_sort_keys(text) for text in row]
+        else:
+            # only need to try the one cast for each column, so store its
+            # result (or None) rather than a tuple
+            self._sort_keys = [
+                None if cast is None else self._get_sort_keys(text, (cast,))[0]
+                for text, cast in zip(row, self._casts)
+            ]
+        # text is centred and bold by the DataViewer's CentredItemDelegate
         for idx, text in enumerate(row):
             self.setText(idx, text)
-            self.setTextAlignment(idx, Qt.AlignCenter)
-            font = self.font(idx)
-            font.setBold(True)
-            self.setFont(idx, font)
 
     @property
     def month_year(self):
@@ -87,24 +131,93 @@ class CycleTreeWidgetItem(QTreeWidgetItem):
 
 
 class IndexTreeWidgetItem(QTreeWidgetItem):
-    """QTreeWidgetItem that stores the index of the DataFrame row it represents."""
+    """
+    QTreeWidgetItem that stores the index of the DataFrame row it represents.
+
+    Each column is sorted by its value, rather than its text, according to the
+    dtype of its measure. If the text can't be converted, it is sorted by text.
 
-    def __init__(self, *args, activity=None, index=None, headerLabels=[], row={}, **kwargs):
+    Unlike `CycleTreeWidgetItem`, `sortColumn` doesn't need to be set; it is the
+    tree's sort column, which `QTreeWidget.sortItems` sets.
+    """
+
+    # functions to convert text to a sortable value, for each measure dtype
+    _sort_casts = {
+        "float": float,
+        "int": float,
+        "date": dayMonthYearToFloat,
+        "duration": hourMinSecToFloat,
+    }
+
+    def __init__(
+        self, *args, activity=None, index=None, headerLabels=[], row={}, columns=None, **kwargs
+    ):
         super().__init__(*args, **kwargs)
         self._activity = activity
         self.index = index
         self.headerLabels = headerLabels
+        if columns is None:
+            columns = self.get_columns(activity)
+        self._columns = columns
         self.setRow(row)
 
+    @classmethod
+    def get_columns(cls, activity) -> tuple:
+        """
+        Return tuple of (column name, sort cast) pairs for each measure in `activity`.
+
+        This can be made once and passed as the `columns` arg to each item.
+        """
+        return tuple(
+            (name, cls._sort_casts.get(measure.dtype))
+            for name, measure in activity.measures.items()
+        )
+
+    @property
+    def sortColumn(self):
+        if (tree := self.treeWidget()) is None:
+            return 0
+        # DataViewer's `sortColumn` attribute hides the QTreeView method
+        return max(QTreeWidget.sortColumn(tree), 0)
+
+    def __lt__(self, other):
+        col = self.sortColumn
+        key0, key1 = self._sort_keys[col], other._sort_keys[col]
+        if key0 is not None and key1 is not None:
+            return key0 < key1
+        return self.text(col) < other.text(col)
+
     def setRow(self, row):
         self.row = row
-        for idx, col in enumerate(self._activity.measures):
-            value = self.row[col]
+        # cast the text once here, rather than on every comparison when sorting
+        self._sort_keys = []
+        for idx, (col, cast) in enumerate(self._columns):
+            value = row[col]
             self.setText(idx, value)
-            self.setTextAlignment(idx, Qt.AlignCenter)
+            if cast is not None:
+                try:
+                    value = cast(value)
+                except (ValueError, TypeError):
+                    # e.g. 'nan:nan:nan', so sort by text instead
+                    value = None
+            self._sort_keys.append(value)
+
+
+class CentredItemDelegate(QStyledItemDelegate):
+    """
+    Item delegate which centres the text of every item and makes top level items bold.
+
+    This saves setting the alignment and font of every cell of every item.
+    """
 
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.displayAlignment = Qt.AlignCenter
+        if not index.parent().isValid():
+            option.font.setBold(True)
 
-@dataclass
+
+@dataclass(slots=True)
 class TreeItem:
     dateTime: object = None
     topLevelItem: CycleTreeWidgetItem = None
@@ -160,6 +273,10 @@ class DataViewer(QTreeWidget):
 
         self.data = data
         self._activity = activity
+        # columns of each IndexTreeWidgetItem and casts for each
+        # CycleTreeWidgetItem, made once for all of them
+        self._item_columns = IndexTreeWidgetItem.get_columns(activity)
+        self._month_casts = CycleTreeWidgetItem.get_casts(activity)
 
         self.widthSpace = widthSpace
         self.dateFmt = "%d %b %Y"
@@ -174,9 +291,18 @@ class DataViewer(QTreeWidget):
         # align header text centrally
         for idx in range(len(self._activity.header)):
             self.headerItem().setTextAlignment(idx, Qt.AlignCenter)
+        # fonts for the header labels, set in `sort_tree`
+        self._header_font = QFont(self.headerItem().font(0))
+        self._header_font.setWeight(QFont.Normal)
+        self._sort_header_font = QFont(self._header_font)
+        self._sort_header_font.setWeight(QFont.ExtraBold)
+        self._header_sort_column = None
 
         self.setSelectionMode(QAbstractItemView.ExtendedSelection)
 
+        self._delegate = CentredItemDelegate(self)
+        self.setItemDelegate(self._delegate)
+
         self.make_tree()
 
         self.sortColumn = None
@@ -186,7 +312,14 @@ class DataViewer(QTreeWidget):
 
         self.currentItemChanged.connect(self._item_changed)
 
-        self.itemSelectionChanged.connect(self._summarise_selected)
+        # selection can change many times in quick succession (e.g. when
+        # holding down shift and an arrow key), so only summarise it once
+        # control returns to the event loop
+        self._summary_timer = QTimer(self)
+        self._summary_timer.setSingleShot(True)
+        self._summary_timer.setInterval(0)
+        self._summary_timer.timeout.connect(self._summarise_selected)
+        self.itemSelectionChanged.connect(self._summary_timer.start)
 
         self.sort_tree(0)
 
@@ -215,7 +348,7 @@ class DataViewer(QTreeWidget):
         menu.exec_(self.mapToGlobal(pos))
 
     def _edit_items(self):
-        items = [item for item in self.selectedItems() if item not in self.top_level_items]
+        items = [item for item in self.selectedItems() if not self._is_top_level(item)]
         if items:
             self.dialog = EditItemDialog(self._activity, items, self._activity.header)
             result = self.dialog.exec_()
@@ -238,7 +371,15 @@ class DataViewer(QTreeWidget):
 
     @property
     def top_level_items_dict(self):
-        return {item.month_year: item for item in self.top_level_items}
+        """Dict of 'month year' string: top level QTreeWidgetItem."""
+        return self._top_level_items_dict
+
+    @staticmethod
+    def _is_top_level(item):
+        """Return True if `item` is a top level (month) item."""
+        # only months are CycleTreeWidgetItems, so there's no need to search
+        # the list of top level items
+        return isinstance(item, CycleTreeWidgetItem)
 
     @Slot(object)
     def new_data(self, indices=None):
@@ -254,54 +395,78 @@ class DataViewer(QTreeWidget):
             self._make_tree()
             return
 
-        indices = list(indices)  # cast to list so updated items can be removed
-
-        # update changed items
-        changed = []
-        for item in self.items:
-            if (idx := item.treeWidgetItem.index) in indices:
-                # if index is already in tree, update that row and remove from indices list
-                item.treeWidgetItem.setRow(self.data.row(idx, formatted=True))
-                indices.remove(idx)
-                # store month and year of changed items, so top level items can be
-                # updated where necessary
-                date = self.data[idx, "date"]
-                if (month_year := (date.month, date.year)) not in changed:
-                    changed.append(month_year)
-
-        # update top level items of changed months
-        for month, year in changed:
-            data = self.data.get_month(month, year, return_type="Data")
-            summaries = list(data.make_summary().values())
-            month_year = f"{calendar.month_name[date.month]} {date.year}"
-            rootText = [month_year] + summaries
-            rootItem = self.top_level_items_dict[month_year]
-            rootItem.setRow(rootText)
-
-        # for remaining indices add new rows to tree
-        for idx in indices:
-            date = self.data[idx, "date"]
-            month_year = f"{calendar.month_name[date.month]} {date.year}"
-            data = self.data.get_month(date.month, date.year, return_type="Data")
-            summaries = list(data.make_summary().values())
-            rootText = [month_year] + summaries
-            if month_year not in self.top_level_items_dict:
-                rootItem = CycleTreeWidgetItem(self, row=rootText)
-            else:
-                rootItem = self.top_level_items_dict[month_year]
-                rootItem.setRow(rootText)
-
-            item = IndexTreeWidgetItem(
-                rootItem,
-                activity=self._activity,
-                index=idx,
-                headerLabels=self._activity.header,
-                row=self.data.row(idx, formatted=True),
-            )
-            itemData = TreeItem(self.data["date"][idx], rootItem, item)
-            self.items.append(itemData)
+        # update changed items, and store month and year of all given indices,
+        # so that each affected top level item is only summarised once
+        # get all the rows and dates in one go, rather than one at a time
+        indices = list(dict.fromkeys(indices))
+        if not indices:
+            # nothing to update, so no need to re-sort
+            return
+        with self._updates_paused():
+            rows = self.data.rows(indices, formatted=True)
+            dates = self.data["date"].gather(indices)
+            month_keys = list(zip(dates.dt.month().to_list(), dates.dt.year().to_list()))
+            changed = set(month_keys)
+            new_rows = []
+            moved = []
+            for idx, row, date, month_key in zip(indices, rows, dates.to_list(), month_keys):
+                if (item := self._items_by_index.get(idx)) is None:
+                    new_rows.append((idx, row, date, month_key))
+                    continue
+                # if index is already in tree, update that row
+                item.treeWidgetItem.setRow(row)
+                if item.dateTime != date:
+                    self._set_item_date(item, date)
+                if (old_key := item.topLevelItem.month_key) != month_key:
+                    # date moved to another month, so re-use the item under that
+                    # month, rather than making a new one
+                    changed.add(old_key)
+                    moved.append((item, month_key))
+
+            # update (or make) top level items of changed months
+            top_level_items = self._top_level_items_dict
+            empty = []
+            for month, year in changed:
+                data = self.data.get_month(month, year, return_type="Data")
+                month_year = _month_year_str(month, year)
+                if len(data) == 0:
+                    empty.append(month_year)
+                    continue
+                summaries = list(data.make_summary().values())
+                rootText = [month_year] + summaries
+                if (rootItem := top_level_items.get(month_year)) is None:
+                    rootItem = CycleTreeWidgetItem(
+                        self, row=rootText, casts=self._month_casts, month_key=(month, year)
+                    )
+                    top_level_items[month_year] = rootItem
+                else:
+                    rootItem.setRow(rootText)
+
+            for item, month_key in moved:
+                rootItem = top_level_items[_month_year_str(*month_key)]
+                item.topLevelItem.removeChild(item.treeWidgetItem)
+                rootItem.addChild(item.treeWidgetItem)
+                item.topLevelItem = rootItem
+
+            # remove months which no longer have any data
+            for month_year in empty:
+                if (rootItem := top_level_items.pop(month_year, None)) is not None:
+                    self.takeTopLevelItem(self.indexOfTopLevelItem(rootItem))
+
+            # for remaining indices add new rows to tree
+            for idx, row, date, month_key in new_rows:
+                rootItem = top_level_items[_month_year_str(*month_key)]
+                item = IndexTreeWidgetItem(
+                    rootItem,
+                    activity=self._activity,
+                    index=idx,
+                    headerLabels=self._activity.header,
+                    row=row,
+                    columns=self._item_columns,
+                )
+                self._add_item(TreeItem(date, rootItem, item))
 
-        self.sort_tree(self.sortColumn, switchOrder=False)
+            self.sort_tree(self.sortColumn, switchOrder=False)
 
         self.viewer_updated.emit()
 
@@ -312,23 +477,22 @@ class DataViewer(QTreeWidget):
             if item.isExpanded():
                 expanded.append(item.text(0))
 
-        self.clear()
-        self.make_tree()
-        for item in self.top_level_items:
-            if item.text(0) in expanded:
-                self.expandItem(item)
+        with self._updates_paused():
+            self.clear()
+            self.make_tree()
+            for item in self.top_level_items:
+                if item.text(0) in expanded:
+                    self.expandItem(item)
 
         self.viewer_updated.emit()
 
     def update_top_level_items(self):
-        dfs = self.data.split_months(return_type="Data")
-        for month_year, data in reversed(dfs):
+        for month_year, data in self._months().items():
             # root item of tree: summary of month, with total time, distance
             # and calories (in bold)
-            month_year = month_year.strftime("%B %Y")
             summaries = list(data.make_summary().values())
             rootText = [month_year] + summaries
-            rootItem = self.top_level_items_dict[month_year]
+            rootItem = self._top_level_items_dict[month_year]
             rootItem.setRow(rootText)
         self.viewer_updated.emit()
 
@@ -347,19 +511,18 @@ class DataViewer(QTreeWidget):
 
         order = Qt.DescendingOrder if self.sortDescending[idx] else Qt.AscendingOrder
 
-        # set sort column index
+        # set sort column index; child items get theirs from the tree
         for rootItem in self.top_level_items:
             rootItem.sortColumn = idx
         self.sortColumn = idx
 
-        # make header label for sort column italic
-        for i in range(self.header().count()):
-            font = self.headerItem().font(i)
-            if i == idx:
-                font.setWeight(QFont.ExtraBold)
-            else:
-                font.setWeight(QFont.Normal)
-            self.headerItem().setFont(i, font)
+        # make header label for sort column bold; only the previous and new
+        # sort columns' labels need changing
+        if (previous := self._header_sort_column) != idx:
+            if previous is not None:
+                self.headerItem().setFont(previous, self._header_font)
+            self.headerItem().setFont(idx, self._sort_header_font)
+            self._header_sort_column = idx
 
         self.sortItems(idx, order)
         self.viewer_sorted.emit()
@@ -368,33 +531,89 @@ class DataViewer(QTreeWidget):
         """Populate tree with data from Data object."""
 
         self.items = []
-        dfs = self.data.split_months(return_type="Data")
-        # pandas df had persistent index, polars doesn't
-        # calculate equivalent index here
-        # starting from len(data), because we go through the months backwards
-        idx = len(self.data) - 1
-
-        for month_year, data in reversed(dfs):
-            # root item of tree: summary of month, with total time, distance
-            # and calories (in bold)
-            summaries = list(data.make_summary().values())
-            rootText = [month_year.strftime("%B %Y")] + summaries
-            rootItem = CycleTreeWidgetItem(self, row=rootText)
-
-            # make rows of data for tree
-            for rowIdx in reversed(range(len(data))):
-                item = IndexTreeWidgetItem(
-                    rootItem,
-                    activity=self._activity,
-                    index=idx,
-                    headerLabels=self._activity.header,
-                    row=data.row(rowIdx, formatted=True),
+        self._top_level_items_dict = {}
+        # TreeItems by row index, by (id of) QTreeWidgetItem and by date
+        self._items_by_index = {}
+        self._items_by_widget = {}
+        self._items_by_date = {}
+        # nothing needs to respond to the items as they're added
+        with self._updates_paused(block_signals=True):
+            dfs = self.data.split_months(return_type="Data")
+            # pandas df had persistent index, polars doesn't
+            # calculate equivalent index here
+            # starting from len(data), because we go through the months backwards
+            idx = len(self.data) - 1
+
+            for month_year, data in reversed(dfs):
+                # root item of tree: summary of month, with total time, distance
+                # and calories (in bold)
+                summaries = list(data.make_summary().values())
+                rootText = [_month_year_str(month_year.month, month_year.year)] + summaries
+                rootItem = CycleTreeWidgetItem(
+                    self,
+                    row=rootText,
+                    casts=self._month_casts,
+                    month_key=(month_year.month, month_year.year),
                 )
-                itemData = TreeItem(data["date"][rowIdx], rootItem, item)
-                self.items.append(itemData)
-                idx -= 1
+                self._top_level_items_dict[rootItem.month_year] = rootItem
+
+                # make rows of data for tree, most recent first
+                row_indices = range(len(data) - 1, -1, -1)
+                rows = data.rows(row_indices, formatted=True)
+                dates = data["date"].to_list()
+                for rowIdx, row in zip(row_indices, rows):
+                    item = IndexTreeWidgetItem(
+                        rootItem,
+                        activity=self._activity,
+                        index=idx,
+                        headerLabels=self._activity.header,
+                        row=row,
+                        columns=self._item_columns,
+                    )
+                    self._add_item(TreeItem(dates[rowIdx], rootItem, item))
+                    idx -= 1
+
+            self.header().resizeSections(QHeaderView.ResizeToContents)
+
+    def _set_item_date(self, item, date):
+        """Set `dateTime` of TreeItem `item` to `date` and update the lookup by date."""
+        if self._items_by_date.get(item.dateTime) is item:
+            del self._items_by_date[item.dateTime]
+        item.dateTime = date
+        self._items_by_date[date] = item
+
+    @contextlib.contextmanager
+    def _updates_paused(self, block_signals=False):
+        """
+        Context manager to stop the tree repainting while many items are changed.
+
+        Automatic sorting is also turned off, so that items aren't moved as
+        they are added; call `sort_tree` once they have all been added.
 
-        self.header().resizeSections(QHeaderView.ResizeToContents)
+        If `block_signals` is True, also block the tree's signals (e.g.
+        `currentItemChanged`) until the block is finished.
+        """
+        enabled = self.updatesEnabled()
+        sorting = self.isSortingEnabled()
+        self.setUpdatesEnabled(False)
+        self.setSortingEnabled(False)
+        blocked = self.blockSignals(True) if block_signals else None
+        try:
+            yield
+        finally:
+            if block_signals:
+                self.blockSignals(blocked)
+            self.setSortingEnabled(sorting)
+            self.setUpdatesEnabled(enabled)
+
+    def _add_item(self, item):
+        """Append TreeItem `item` to `items` and add it to the lookup dicts."""
+        self.items.append(item)
+        # as with searching `items`, the first item with an index is the one found...
+        self._items_by_index.setdefault(item.treeWidgetItem.index, item)
+        self._items_by_widget[id(item.treeWidgetItem)] = item
+        # ...but the last one with a date is the one highlighted
+        self._items_by_date[item.dateTime] = item
 
     @Slot()
     def combine_rows(self):
@@ -404,38 +623,41 @@ class DataViewer(QTreeWidget):
             return None
 
         # TODO gear hardcoded here
-        idx = self._activity.measure_slugs.index("date")
-        dates = [item.text(idx) for item in selected]
-        idx = self._activity.measure_slugs.index("gear")
-        gears = [item.text(idx) for item in selected]
+        date_idx = self._activity.measure_slugs.index("date")
+        gear_idx = self._activity.measure_slugs.index("gear")
+        date = selected[0].text(date_idx)
+        gear = selected[0].text(gear_idx)
+
+        # walk the selection once, stopping at the first date that differs
+        # (which takes priority) and only reading gears until one differs
+        gears_match = True
+        for item in selected[1:]:
+            if item.text(date_idx) != date:
+                msg = "dates do not match"
+                break
+            if gears_match and item.text(gear_idx) != gear:
+                gears_match = False
+        else:
+            msg = None if gears_match else "gears do not match"
 
-        if len(set(dates)) > 1:
+        if msg is not None:
             QMessageBox.warning(
                 self,
                 "Cannot combine selected data",
-                "Cannot combine selected data - dates do not match.",
-            )
-        elif len(set(gears)) > 1:
-            QMessageBox.warning(
-                self,
-                "Cannot combine selected data",
-                "Cannot combine selected data - gears do not match.",
+                f"Cannot combine selected data - {msg}.",
             )
         else:
-            self.data.combine_rows(dates[0])
+            self.data.combine_rows(date)
 
     @Slot(object)
     def highlight_item(self, date):
-        for item in self.items:
-            if item.dateTime == date:
-                self.setCurrentItem(item.treeWidgetItem)
+        if (item := self._items_by_date.get(date)) is not None:
+            self.setCurrentItem(item.treeWidgetItem)
 
     @Slot(QTreeWidgetItem, QTreeWidgetItem)
     def _item_changed(self, currentItem, previousItem):
-        for item in self.items:
-            if item.treeWidgetItem == currentItem:
-                self.item_selected.emit(item.dateTime)
-                break
+        if (item := self._items_by_widget.get(id(currentItem))) is not None:
+            self.item_selected.emit(item.dateTime)
 
     @Slot()
     def _summarise_selected(self):
@@ -445,43 +667,42 @@ class DataViewer(QTreeWidget):
         If a top level item is selected, summarise it. Otherwise, summarise
         multiple selected items.
         """
-        if len(self.selectedItems()) == 0:
+        selected = self.selectedItems()
+        if len(selected) == 0:
             return
         s = ""
-        if (
-            len(self.selectedItems()) == 1
-            and (item := self.selectedItems()[0]) in self.top_level_items
-        ):
+        if len(selected) == 1 and self._is_top_level(item := selected[0]):
             s = self._summarise_month(item)
-        elif all([item in self.top_level_items for item in self.selectedItems()]):
-            s = self._summarise_months(self.selectedItems())
-        elif (
-            len(
-                (
-                    idx := [
-                        item.index
-                        for item in self.selectedItems()
-                        if item not in self.top_level_items
-                    ]
-                )
-            )
-            > 1
-        ):
-            df = self.data.df[idx]
-            data = Data(df, activity=self._activity)
+        elif all(self._is_top_level(item) for item in selected):
+            s = self._summarise_months(selected)
+        elif len(idx := [item.index for item in selected if not self._is_top_level(item)]) > 1:
+            # rows of `data` already have all dtypes and relations
+            data = Data._from_trusted_df(self.data.df[idx], self._activity)
             s = self._summarise_data(data)
         if s:
             self.selected_summary.emit(s)
 
     def _summarise_month(self, item):
         """Summarise month given by `item`"""
-        if item not in self.top_level_items:
+        if not self._is_top_level(item):
             raise ValueError("_summarise_month can only summarise top-level tree items")
-        months = self.data.split_months(return_type="Data")
-        month, *_ = [
-            data for month_year, data in months if month_year.strftime("%B %Y") == item.text(0)
-        ]
-        return self._summarise_data(month)
+        if item.month_key is not None:
+            data = self.data.get_month(*item.month_key, return_type="Data")
+        else:
+            data = self._months()[item.text(0)]
+        return self._summarise_data(data)
+
+    def _months(self) -> dict:
+        """
+        Return dict of 'month year' string: Data for each month in `data`.
+
+        `Data.split_months` is memoised until the data changes, so this only
+        has to label the months, rather than split the data each time.
+        """
+        return {
+            _month_year_str(month_year.month, month_year.year): data
+            for month_year, data in self.data.split_months(return_type="Data")
+        }
 
     def _summarise_data(self, data):
         """Return string of summarised `data`, where `data` is a :class:`Data` object"""
@@ -492,18 +713,15 @@ class DataViewer(QTreeWidget):
 
     def _summarise_months(self, items):
         """Return summary string from list of top-level items"""
-        if any([item not in self.top_level_items for item in items]):
+        if not all(self._is_top_level(item) for item in items):
             raise ValueError("_summarise_months can only summarise top-level tree items")
-        selected_months = [item.text(0) for item in items]
-
-        months = self.data.split_months(return_type="Data")
+        selected_months = {item.text(0) for item in items}
 
-        months = map(
-            lambda tup: tup.data,
-            filter(lambda tup: tup.month_year in selected_months, months),
-        )
+        months = [
+            data for month_year, data in self._months().items() if month_year in selected_months
+        ]
 
-        if months := list(months):
+        if months:
 
             concat_data = Data.concat(months, self._activity)
 
@@ -56,38 +56,48 @@ class EditItemDialog(AddDataTableMixin, QDialog):
 
         self.rows = []
 
-        for rowNum, item in enumerate(items):
-            self.table.insertRow(rowNum)
-            col = 0
-
-            checkBox = QCheckBox()
-            checkBox.setChecked(True)
-            checkBox.setToolTip("Uncheck to remove this data")
-            # have to make a widget with a layout and add the check box to
-            # the layout in order to have the check box centred...
-            widget = QWidget()
-            layout = QVBoxLayout()
-            layout.addWidget(checkBox)
-            layout.setAlignment(Qt.AlignCenter)
-            widget.setLayout(layout)
-            self.table.setCellWidget(rowNum, col, widget)
-            col += 1
-
-            tableItems = {}
-            for idx in range(item.columnCount()):
-                if itemHeader[idx] in self.header_labels:
-                    text = item.text(idx)
-                    tableItem = QTableWidgetItem(text)
+        # columns of `items` to show, and the measure in each, are the same for
+        # every item, so find them once
+        columns = [
+            (idx, self._activity.get_measure(label).slug)
+            for idx, label in enumerate(itemHeader)
+            if label in self.header_labels
+        ]
+
+        # add all the rows at once, and don't repaint until they're filled
+        enabled = self.table.updatesEnabled()
+        self.table.setUpdatesEnabled(False)
+        try:
+            self.table.setRowCount(len(items))
+
+            for rowNum, item in enumerate(items):
+                col = 0
+
+                checkBox = QCheckBox()
+                checkBox.setChecked(True)
+                checkBox.setToolTip("Uncheck to remove this data")
+                # have to make a widget with a layout and add the check box to
+                # the layout in order to have the check box centred...
+                widget = QWidget()
+                layout = QVBoxLayout()
+                layout.addWidget(checkBox)
+                layout.setAlignment(Qt.AlignCenter)
+                widget.setLayout(layout)
+                self.table.setCellWidget(rowNum, col, widget)
+                col += 1
+
+                tableItems = {}
+                for idx, slug in columns:
+                    tableItem = QTableWidgetItem(item.text(idx))
                     tableItem.setTextAlignment(Qt.AlignCenter)
                     tableItem.setFlags(Qt.ItemIsEditable | Qt.ItemIsEnabled)
                     self.table.setItem(rowNum, col, tableItem)
-
-                    measure = self._activity.get_measure(itemHeader[idx])
-                    tableItems[measure.slug] = tableItem
+                    tableItems[slug] = tableItem
                     col += 1
 
-            self.rows.append(Row(item.index, tableItems, checkBox))
-            col += 1
+                self.rows.append(Row(item.index, tableItems, checkBox))
+        finally:
+            self.table.setUpdatesEnabled(enabled)
 
         self.buttonBox = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
 
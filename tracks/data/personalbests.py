@@ -153,9 +153,13 @@ class PersonalBests(QTableWidget):
             cols.append("date")
 
         df = self.data.sort(
-            cols, descending=descending, return_type="DataFrame", with_index=True, index_name="idx"
+            cols,
+            descending=descending,
+            return_type="DataFrame",
+            with_index=True,
+            index_name="idx",
+            limit=num,
         )
-        df = df[:num]
 
         pb = []
         for row in df.rows(named=True):
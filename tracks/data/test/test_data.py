@@ -1,9 +1,12 @@
 from .. import Data
+from .._kernels import local_midnight_timestamps
 from tracks.test import make_dataframe
 from tracks.test.mockparent import load_activity
 import polars as pl
 import numpy as np
 import random
+from datetime import date, datetime, timedelta
+import time
 import pytest
 
 pytest_plugin = "pytest-qt"
@@ -103,3 +106,134 @@ def test_monthly_odometer(setup):
             expected_dist += row["distance"][0]
             df_idx += 1
         assert dist == expected_dist
+
+
+def test_append_index(setup, qtbot):
+    data, _ = setup
+    dates = data.df["date"].sort()
+    row = {name: [data.df[0, name]] for name in ["time", "distance", "calories", "gear"]}
+    # one row in the middle of the existing data and one after all of it
+    row = {name: value * 2 for name, value in row.items()}
+    new_dates = [dates[len(dates) // 2], dates[-1] + (dates[-1] - dates[-2])]
+    row["date"] = new_dates
+
+    with qtbot.waitSignal(data.data_changed) as blocker:
+        data.append(row)
+
+    # existing rows after the back-dated one have moved, so no indices are given
+    assert blocker.args[0] is None
+    assert len(data) == len(dates) + 2
+    assert data.df["date"].is_sorted()
+    assert data.df["date"].is_in(new_dates).sum() >= 2
+
+    # appending after all the existing data doesn't move anything
+    row["date"] = [new_dates[-1] + timedelta(days=1)] * 2
+    with qtbot.waitSignal(data.data_changed) as blocker:
+        data.append(row)
+
+    assert blocker.args[0] == [len(data) - 2, len(data) - 1]
+
+
+@pytest.mark.parametrize("pb_count", [1, 3, 5])
+def test_get_pbs(setup, pb_count):
+    data, _ = setup
+    values = list(data["speed"])
+
+    expected = []
+    best = []
+    for n, value in enumerate(values):
+        if len(best) < pb_count or value >= min(best):
+            expected.append(n)
+            best = sorted(best + [value])[-pb_count:]
+
+    assert data.get_pbs("speed", pb_count) == expected
+
+
+def test_unknown_attribute(setup):
+    data, _ = setup
+    assert data.distance is data["distance"]
+    assert not hasattr(data, "not_a_column")
+    with pytest.raises(AttributeError):
+        data.not_a_column
+
+
+def test_date_dtype(setup):
+    data, activity = setup
+    df = data.df.with_columns(pl.col("date").cast(pl.Datetime("us")))
+    new_data = Data(df, activity=activity)
+    assert new_data.df["date"].dtype == pl.Date
+    assert new_data.df["date"].to_list() == data.df["date"].to_list()
+
+
+def test_set_data_frame(setup, qtbot):
+    data, _ = setup
+    expected = data.df
+    df = expected.with_columns(pl.col("date").cast(pl.Datetime("us"))).drop("speed")
+
+    with qtbot.waitSignal(data.data_changed) as blocker:
+        data.set_data_frame(df)
+
+    assert blocker.args[0] is None
+    assert data.df.schema == expected.schema
+    assert data.date_timestamps.tolist() == [dt.timestamp() for dt in data.datetimes]
+
+
+def test_repr(setup):
+    data, activity = setup
+    # columns without a measure and missing values are still shown
+    assert "index" in repr(data.sort("speed", with_index=True))
+    df = data.df.with_columns(distance=pl.lit(None, dtype=pl.Float64))
+    assert "null" in repr(Data(df, activity=activity))
+
+
+@pytest.fixture
+def timezone(request, monkeypatch):
+    monkeypatch.setenv("TZ", request.param)
+    time.tzset()
+    yield request.param
+    monkeypatch.undo()
+    time.tzset()
+
+
+# zones with DST, without DST, and which have abolished it
+@pytest.mark.parametrize(
+    "timezone",
+    ["UTC", "Europe/London", "America/Sao_Paulo", "Europe/Istanbul", "Africa/Casablanca"],
+    indirect=True,
+)
+def test_date_timestamps(setup, timezone):
+    data, activity = setup
+    # spread the dates over 20 years, so they cover changes to the zone's rules
+    interval = f"{7300 // len(data)}d"
+    dates = pl.date_range(date(2005, 1, 1), date(2025, 1, 1), interval, eager=True)
+    data = Data(data.df.with_columns(date=dates.head(len(data))), activity=activity)
+    expected = [dt.timestamp() for dt in data.datetimes]
+    assert data.date_timestamps.tolist() == expected
+
+
+def test_append_unsorted(setup, qtbot):
+    data, _ = setup
+    last = data.df["date"].max()
+    row = {name: [data.df[0, name]] * 2 for name in ["time", "distance", "calories", "gear"]}
+    # both rows after all the existing data, but not in order
+    new_dates = [last + timedelta(days=10), last + timedelta(days=5)]
+    row["date"] = new_dates
+
+    with qtbot.waitSignal(data.data_changed) as blocker:
+        data.append(row)
+
+    index = blocker.args[0]
+    assert data.df["date"].is_sorted()
+    assert data.df["date"].tail(2).to_list() == sorted(new_dates)
+    assert [data.df[idx, "date"] for idx in index] == new_dates
+
+
+@pytest.mark.parametrize(
+    "timezone", ["America/Sao_Paulo", "Europe/Moscow", "America/Mexico_City"], indirect=True
+)
+def test_local_midnight_timestamps(timezone):
+    # every day over 20 years in zones which have abolished DST
+    start = date(2005, 1, 1).toordinal()
+    days = np.arange(start, start + 7300) - date(1970, 1, 1).toordinal()
+    expected = [datetime.fromordinal(day).timestamp() for day in range(start, start + 7300)]
+    assert local_midnight_timestamps(days).tolist() == expected
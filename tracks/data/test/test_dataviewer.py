@@ -1,4 +1,5 @@
 from .. import DataViewer, Data
+from ..dataviewer import IndexTreeWidgetItem
 from ..edititemdialog import EditItemDialog
 from tracks.util import monthYearToFloat, hourMinSecToFloat
 from tracks.test import make_dataframe, MockParent
@@ -62,6 +63,73 @@ class TestDataViewer:
                 items = [item.text(idx) for item in self.widget.top_level_items]
                 assert items == expected
 
+    def test_sort_children(self, setup, qtbot):
+        idx = self.widget._activity.header.index("Distance (km)")
+        with qtbot.waitSignal(self.widget.viewer_sorted):
+            self.widget.header().sectionClicked.emit(idx)
+        order = self.widget.sortDescending[idx]
+        for item in self.widget.top_level_items:
+            values = [float(item.child(i).text(idx)) for i in range(item.childCount())]
+            assert values == sorted(values, reverse=order)
+
+    def test_sort_unparseable(self, setup, qtbot):
+        # a cell which can't be cast is sorted by its text, rather than raising
+        row = self.widget.data.row(0, formatted=True)
+        row["time"] = "nan:nan:nan"
+        other = self.widget._items_by_index[1].treeWidgetItem
+        item = IndexTreeWidgetItem(other.parent(), activity=self.widget._activity, index=0, row=row)
+        idx = self.widget._activity.measure_slugs.index("time")
+        with qtbot.waitSignal(self.widget.viewer_sorted):
+            self.widget.header().sectionClicked.emit(idx)
+        assert item.sortColumn == other.sortColumn == idx
+        assert (item < other) == ("nan:nan:nan" < other.text(idx))
+
+    def test_summarise_months(self, setup, qtbot):
+        items = self.widget.top_level_items[:2]
+        num_sessions = sum(item.childCount() for item in items)
+        s = self.widget._summarise_months(items)
+        assert s.startswith(f"2 months; {num_sessions} sessions; ")
+
+    def test_move_item_month(self, setup_known_data, qtbot):
+        item = self.widget._items_by_index[0]
+        old_parent = item.topLevelItem
+        num_children = old_parent.childCount()
+        new_date = date(2030, 1, 5)
+
+        with qtbot.waitSignal(self.widget.viewer_updated):
+            self.widget.data.update({0: {"date": new_date}})
+
+        assert item.topLevelItem.text(0) == "January 2030"
+        assert item.treeWidgetItem.parent() is item.topLevelItem
+        assert old_parent.childCount() == num_children - 1
+        assert self.widget._items_by_date[new_date] is item
+
+    def test_append_back_dated(self, setup_known_data, qtbot):
+        data = self.widget.data
+        row = {name: [data.df[0, name]] for name in ["time", "distance", "calories", "gear"]}
+        row["date"] = [data.df[1, "date"]]
+
+        with qtbot.waitSignal(self.widget.viewer_updated):
+            data.append(row)
+
+        # every row has an item, and each item's index refers to its own row
+        assert len(self.widget._items_by_index) == len(data)
+        for idx, item in self.widget._items_by_index.items():
+            assert item.treeWidgetItem.index == idx
+            assert item.dateTime == data.df[idx, "date"]
+
+    def test_combine_rows_items(self, setup_known_data, qtbot):
+        data = self.widget.data
+        data.update({1: {"date": data.df[0, "date"], "gear": data.df[0, "gear"]}})
+
+        with qtbot.waitSignal(self.widget.viewer_updated):
+            data.combine_rows(data.df[0, "date"].strftime("%d %b %Y"))
+
+        assert len(self.widget._items_by_index) == len(data)
+        for idx, item in self.widget._items_by_index.items():
+            assert item.treeWidgetItem.index == idx
+            assert item.dateTime == data.df[idx, "date"]
+
     def test_new_data(self, setup, qtbot):
         # expand some headers
         min_expanded = 3
@@ -404,7 +404,7 @@ class Plot(_PlotWidget):
         Mode must be 'new' (to add a new series) or 'set' to upadte the data in
         an existing series.
         """
-        series = self.data[key]
+        series = self.data[key].to_numpy()
         self._plot_item.getAxis("left").tickFormatter = floatToHourMinSec if key == "time" else None
 
         # make style
@@ -579,7 +579,8 @@ class Plot(_PlotWidget):
             mousePoint = self._plot_item.vb.mapSceneToView(pos)
 
             idx = int(mousePoint.x())
-            if idx > min(self.data.date_timestamps) and idx < max(self.data.date_timestamps):
+            timestamps = self.data.date_timestamps
+            if timestamps.min() < idx < timestamps.max():
                 self.set_current_point_from_timestamp(idx)
                 pts = self._scatter_points_at_x(mousePoint, self.dataItem.scatter)
                 if len(pts) != 0:
@@ -14,6 +14,7 @@ from .convertfuncs import (
     monthYearToFloat,
     dayMonthYearToFloat,
     floatToHourMinSec,
+    durations_to_float,
     parse_month_range,
     date_to_timestamp,
 )
@@ -42,6 +43,7 @@ __all__ = [
     "parseDuration",
     "parseDate",
     "floatToHourMinSec",
+    "durations_to_float",
     "int_to_str",
     "parse_month_range",
     "get_cast_func",
@@ -11,6 +11,21 @@ can be sorted.
 from datetime import date, datetime
 import calendar
 import re
+import polars as pl
+
+# dictionary of month names and abbreviations : number, for `parseDate`
+_months = {
+    **{v: k for k, v in enumerate(calendar.month_abbr)},
+    **{v: k for k, v in enumerate(calendar.month_name)},
+}
+del _months[""]
+
+# `hourMinSecToFloat` modes : factor to convert hours to that unit
+_time_modes = {
+    **dict.fromkeys(["s", "sec", "secs", "seconds"], 3600),
+    **dict.fromkeys(["m", "min", "mins", "minutes"], 60),
+    **dict.fromkeys(["h", "hr", "hour", "hours"], 1),
+}
 
 
 def parse_month_range(s) -> int:
@@ -116,14 +131,6 @@ def parseDate(value):
     if not isinstance(value, str):
         raise TypeError(f"Cannot format '{value}' as date. Input should be a string.")
 
-    # make dictionary of month names and abbreviations : number
-    c_abbr = {v: k for k, v in enumerate(calendar.month_abbr)}
-    c_full = {v: k for k, v in enumerate(calendar.month_name)}
-    months = {**c_abbr, **c_full}
-
-    # remove {'':0} from dictionary
-    del months[""]
-
     # get current date and use as default output
     today = date.today()
     d = [today.year, today.month, today.day]
@@ -158,7 +165,7 @@ def parseDate(value):
 
             # if month isn't a number, check if it's in the dictionary
             try:
-                d[-(n + 1)] = months[l[n]]
+                d[-(n + 1)] = _months[l[n]]
             except KeyError:
                 msg = "Please check given month."
                 raise ValueError(f'Cannot format "{value}" as date. {msg}')
@@ -207,12 +214,8 @@ def hourMinSecToFloat(value, mode="hour", strict=True) -> float:
     # hours, mins, secs = value.split(':')
     # value = float(hours) + (float(mins)/60) + (float(secs)/3600)
 
-    seconds = ["s", "sec", "secs", "seconds"]
-    minutes = ["m", "min", "mins", "minutes"]
-    hours = ["h", "hr", "hour", "hours"]
-    valid = seconds + minutes + hours
-    if mode not in valid:
-        msg = f"Mode '{mode}' not in valid modes: {valid}"
+    if (factor := _time_modes.get(mode)) is None:
+        msg = f"Mode '{mode}' not in valid modes: {list(_time_modes)}"
         raise ValueError(msg)
 
     msg = ""
@@ -236,12 +239,31 @@ def hourMinSecToFloat(value, mode="hour", strict=True) -> float:
 
     value = float(hr) + (float(mins) / 60) + (float(sec) / 3600)
 
-    if mode in hours:
+    if factor == 1:
         return value
-    elif mode in minutes:
-        return value * 60
-    else:
-        return value * 3600
+    return value * factor
+
+
+def durations_to_float(series: pl.Series) -> pl.Series:
+    """Convert a Series of [hh]:mm:[ss] strings to a Series of float hours.
+
+    Vectorised equivalent of `hourMinSecToFloat(parseDuration(value))` for each
+    value in `series`. Nulls are preserved.
+    """
+    parts = series.str.split(":")
+    values = parts.explode().drop_nulls()
+    if (parts.list.len() > 3).any() or not values.str.contains(r"^\d+$").all():
+        raise ValueError("Times must be in [hh]:mm:[ss] format.")
+
+    n = pl.col("parts").list.len()
+    a, b, c = [pl.col("parts").list.get(i, null_on_oob=True).cast(pl.Int64) for i in range(3)]
+    hours = pl.when(n == 1).then(0).when(n == 2).then(a // 60).otherwise(a)
+    mins = pl.when(n == 1).then(a).when(n == 2).then(a % 60).otherwise(b)
+    secs = pl.when(n == 1).then(0).when(n == 2).then(b).otherwise(c)
+
+    df = pl.DataFrame({"parts": parts})
+    value = hours.cast(pl.Float64) + (mins / 60) + (secs / 3600)
+    return df.select(value.alias(series.name)).to_series()
 
 
 def monthYearToFloat(value) -> float:
@@ -249,13 +271,8 @@ def monthYearToFloat(value) -> float:
     compare or sort many values.
     """
     month, year = value.split(" ")
-    try:
-        idx = list(calendar.month_name).index(month)
-    except ValueError:
-        try:
-            idx = list(calendar.month_abbr).index(month)
-        except ValueError:
-            raise ValueError(f"{month} is not valid month")
+    if (idx := _months.get(month)) is None:
+        raise ValueError(f"{month} is not valid month")
     if len(year) != 4:
         raise ValueError("'year' should be four digits")
     year = float(year)
@@ -270,13 +287,8 @@ def dayMonthYearToFloat(value) -> float:
     compare or sort many values.
     """
     day, month, year = value.split(" ")
-    try:
-        idx = list(calendar.month_name).index(month)
-    except ValueError:
-        try:
-            idx = list(calendar.month_abbr).index(month)
-        except ValueError:
-            raise ValueError(f"{month} is not valid month")
+    if (idx := _months.get(month)) is None:
+        raise ValueError(f"{month} is not valid month")
     if len(year) != 4:
         raise ValueError("'year' should be four digits")
     if float(day) > 31 or float(day) < 1:
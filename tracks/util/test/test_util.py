@@ -15,6 +15,7 @@ from tracks.util import (
     monthYearToFloat,
     dayMonthYearToFloat,
     floatToHourMinSec,
+    durations_to_float,
 )
 import pytest
 from datetime import datetime, date
@@ -176,6 +177,17 @@ def test_parseDuration(value, expected):
         assert parseDuration(value) == expected
 
 
+def test_durations_to_float():
+    values = [tup[0] for tup in validDurationStrings()]
+    expected = [hourMinSecToFloat(parseDuration(value)) for value in values]
+    series = pl.Series("time", values + [None])
+    assert durations_to_float(series).to_list() == expected + [None]
+
+    for value, _ in invalidDurationStrings():
+        with pytest.raises(ValueError):
+            durations_to_float(pl.Series("time", [value]))
+
+
 @pytest.mark.parametrize("convert_func,check_func,values,expected_idx", convertParams())
 def test_convert_to_float(convert_func, check_func, values, expected_idx):
     for value, expected in values: